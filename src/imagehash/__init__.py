@@ -35,12 +35,13 @@ from imagehash.algorithms import (
 	colorhash,
 	crop_resistant_hash,
 	dhash,
+	dhash_batch,
 	dhash_vertical,
 	phash,
 	phash_simple,
 	whash,
 )
-from imagehash.core import ImageHash, ImageMultiHash
+from imagehash.core import ImageHash, ImageMultiHash, hamming_many, hamming_matrix
 
 # Import type definitions
 from imagehash.types import HashFunc, MeanFunc, NDArray, WhashMode
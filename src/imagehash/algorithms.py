@@ -8,7 +8,7 @@ import numpy
 from PIL import ImageFilter
 
 from imagehash.core import ImageHash, ImageMultiHash
-from imagehash.utils import ANTIALIAS, _find_all_segments
+from imagehash.utils import ANTIALIAS, BOX, _find_all_segments, reduce_prefilter
 
 if TYPE_CHECKING:
 	from PIL import Image
@@ -31,6 +31,7 @@ def average_hash(image: 'Image.Image', hash_size: int = 8, mean: 'MeanFunc' = nu
 		raise ValueError('Hash size must be greater than or equal to 2')
 
 	# reduce size and complexity, then convert to grayscale
+	image = reduce_prefilter(image, hash_size)
 	image = image.convert('L').resize((hash_size, hash_size), ANTIALIAS)
 
 	# find average pixel value; 'pixels' is an array of the pixel values, ranging from 0 (black) to 255 (white)
@@ -54,12 +55,16 @@ def phash(image: 'Image.Image', hash_size: int = 8, highfreq_factor: int = 4) ->
 	if hash_size < 2:
 		raise ValueError('Hash size must be greater than or equal to 2')
 
-	import scipy.fftpack
+	import scipy.fft
 
 	img_size = hash_size * highfreq_factor
+	image = reduce_prefilter(image, img_size)
 	image = image.convert('L').resize((img_size, img_size), ANTIALIAS)
 	pixels = numpy.asarray(image)
-	dct = scipy.fftpack.dct(scipy.fftpack.dct(pixels, axis=0), axis=1)
+	# one fused 2D DCT (pocketfft) instead of two legacy fftpack passes
+	dct = scipy.fft.dctn(
+		pixels.astype(numpy.float32, copy=False), type=2, axes=(0, 1), workers=-1
+	)
 	dctlowfreq = dct[:hash_size, :hash_size]
 	med = numpy.median(dctlowfreq)
 	diff = dctlowfreq > med
@@ -74,12 +79,13 @@ def phash_simple(image: 'Image.Image', hash_size: int = 8, highfreq_factor: int
 
 	@image must be a PIL instance.
 	"""
-	import scipy.fftpack
+	import scipy.fft
 
 	img_size = hash_size * highfreq_factor
+	image = reduce_prefilter(image, img_size)
 	image = image.convert('L').resize((img_size, img_size), ANTIALIAS)
 	pixels = numpy.asarray(image)
-	dct = scipy.fftpack.dct(pixels)
+	dct = scipy.fft.dct(pixels.astype(numpy.float32, copy=False))
 	dctlowfreq = dct[:hash_size, 1 : hash_size + 1]
 	avg = dctlowfreq.mean()
 	diff = dctlowfreq > avg
@@ -100,6 +106,7 @@ def dhash(image: 'Image.Image', hash_size: int = 8) -> ImageHash:
 	if hash_size < 2:
 		raise ValueError('Hash size must be greater than or equal to 2')
 
+	image = reduce_prefilter(image, hash_size)
 	image = image.convert('L').resize((hash_size + 1, hash_size), ANTIALIAS)
 	pixels = numpy.asarray(image)
 	# compute differences between columns
@@ -107,6 +114,26 @@ def dhash(image: 'Image.Image', hash_size: int = 8) -> ImageHash:
 	return ImageHash(diff)
 
 
+def dhash_batch(images: numpy.ndarray) -> list[ImageHash]:
+	"""
+	Difference Hash computation for a batch of pre-resized images.
+
+	@images must be an (N, hash_size, hash_size + 1) uint8 array of grayscale
+	pixel values, one row of the first axis per image, each already resized
+	the way dhash resizes (width one larger than height).
+
+	Computes the column differences of all N images in a single vectorized
+	comparison, so callers hashing many images (or many crops of one image)
+	only pay the Python dispatch once. Returns one ImageHash per image, each
+	identical to what dhash would produce.
+	"""
+	if images.ndim != 3:
+		raise ValueError('Expected a (N, height, width) pixel array')
+	# compute differences between columns
+	diffs = images[:, :, 1:] > images[:, :, :-1]
+	return [ImageHash(diff) for diff in diffs]
+
+
 def dhash_vertical(image: 'Image.Image', hash_size: int = 8) -> ImageHash:
 	"""
 	Difference Hash computation.
@@ -118,6 +145,7 @@ def dhash_vertical(image: 'Image.Image', hash_size: int = 8) -> ImageHash:
 	@image must be a PIL instance.
 	"""
 	# resize(w, h), but numpy.array((h, w))
+	image = reduce_prefilter(image, hash_size)
 	image = image.convert('L').resize((hash_size, hash_size + 1), ANTIALIAS)
 	pixels = numpy.asarray(image)
 	# compute differences between rows
@@ -155,8 +183,11 @@ def whash(image: 'Image.Image', hash_size: int = 8, image_scale: int | None = No
 	assert level <= ll_max_level, 'hash_size in a wrong range'
 	dwt_level = ll_max_level - level
 
+	image = reduce_prefilter(image, image_scale)
 	image = image.convert('L').resize((image_scale, image_scale), ANTIALIAS)
-	pixels = numpy.asarray(image) / 255.0
+	# float32 halves the memory bandwidth through the wavelet transforms;
+	# pywt keeps the dtype through wavedec2/waverec2
+	pixels = numpy.asarray(image).astype(numpy.float32) / numpy.float32(255)
 
 	# Remove low level frequency LL(max_ll) if @remove_max_haar_ll using haar filter
 	if remove_max_haar_ll:
@@ -175,6 +206,48 @@ def whash(image: 'Image.Image', hash_size: int = 8, image_scale: int | None = No
 	return ImageHash(diff)
 
 
+def _intensity_hue_saturation(rgb: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+	"""
+	internal function computing the intensity, hue and saturation channels from
+	an (N, 3) uint32 RGB array. This reproduces the rounding of Pillow's
+	convert('L') and convert('HSV') exactly, so colorhash values stay identical
+	while only one PIL conversion pass is needed.
+	"""
+	r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+	# ITU-R 601-2 luma transform, same fixed-point arithmetic as Pillow's L24()
+	intensity = ((r * 19595 + g * 38470 + b * 7471 + 0x8000) >> 16).astype(numpy.uint8)
+	maxc = numpy.maximum(numpy.maximum(r, g), b)
+	minc = numpy.minimum(numpy.minimum(r, g), b)
+	achromatic = maxc == minc
+	cr = (maxc - minc).astype(numpy.float32)
+	with numpy.errstate(divide='ignore', invalid='ignore'):
+		sat = cr / maxc.astype(numpy.float32)
+		rc = (maxc - r).astype(numpy.float32) / cr
+		gc = (maxc - g).astype(numpy.float32) / cr
+		bc = (maxc - b).astype(numpy.float32) / cr
+	# Pillow's rgb2hsv_row does the g/b branches in double precision before
+	# rounding back to float; mirror that so the truncated hue byte matches
+	hue = numpy.where(
+		r == maxc,
+		bc - gc,
+		numpy.where(
+			g == maxc,
+			(2.0 + rc.astype(numpy.float64) - bc.astype(numpy.float64)).astype(
+				numpy.float32
+			),
+			(4.0 + gc.astype(numpy.float64) - rc.astype(numpy.float64)).astype(
+				numpy.float32
+			),
+		),
+	)
+	hue = numpy.mod(hue.astype(numpy.float64) / 6.0 + 1.0, 1.0).astype(numpy.float32)
+	hue = numpy.where(achromatic, numpy.float32(0), hue)
+	sat = numpy.where(achromatic, numpy.float32(0), sat)
+	h = numpy.clip((hue.astype(numpy.float64) * 255.0).astype(numpy.int64), 0, 255)
+	s = numpy.clip((sat.astype(numpy.float64) * 255.0).astype(numpy.int64), 0, 255)
+	return intensity, h.astype(numpy.uint8), s.astype(numpy.uint8)
+
+
 def colorhash(image: 'Image.Image', binbits: int = 3) -> ImageHash:
 	"""
 	Color Hash computation.
@@ -188,32 +261,41 @@ def colorhash(image: 'Image.Image', binbits: int = 3) -> ImageHash:
 
 	@binbits number of bits to use to encode each pixel fractions
 	"""
-
-	# bin in hsv space:
-	intensity = numpy.asarray(image.convert('L')).flatten()
-	h, s, v = [numpy.asarray(v).flatten() for v in image.convert('HSV').split()]
-	# black bin
-	mask_black = intensity < 256 // 8
-	frac_black = mask_black.mean()
-	# gray bin (low saturation, but not black)
-	mask_gray = s < 256 // 3
-	frac_gray = numpy.logical_and(~mask_black, mask_gray).mean()
-	# two color bins (medium and high saturation, not in the two above)
-	mask_colors = numpy.logical_and(~mask_black, ~mask_gray)
-	mask_faint_colors = numpy.logical_and(mask_colors, s < 256 * 2 // 3)
-	mask_bright_colors = numpy.logical_and(mask_colors, s > 256 * 2 // 3)
-
-	c = max(1, mask_colors.sum())
-	# in the color bins, make sub-bins by hue
-	hue_bins = numpy.linspace(0, 255, 6 + 1)
-	if mask_faint_colors.any():
-		h_faint_counts, _ = numpy.histogram(h[mask_faint_colors], bins=hue_bins)
-	else:
-		h_faint_counts = numpy.zeros(len(hue_bins) - 1)
-	if mask_bright_colors.any():
-		h_bright_counts, _ = numpy.histogram(h[mask_bright_colors], bins=hue_bins)
-	else:
-		h_bright_counts = numpy.zeros(len(hue_bins) - 1)
+	if binbits < 1:
+		raise ValueError('Number of bits must be greater than or equal to 1')
+
+	# colorhash bins fractions of pixels, so a box-averaged downsample of a
+	# very large image leaves the fractions essentially unchanged
+	image = reduce_prefilter(image, 256)
+	# bin in hsv space, decoding the image once instead of once per channel:
+	rgb = numpy.asarray(image.convert('RGB'), dtype=numpy.uint32).reshape(-1, 3)
+	intensity, h, s = _intensity_hue_saturation(rgb)
+	# sort every pixel into one of 15 categories in a single pass:
+	# 0 black, 1 gray (low saturation, but not black),
+	# 2-7 faint colors by hue (medium saturation, not in the two above),
+	# 8-13 bright colors by hue (high saturation, not in the two above),
+	# 14 colors exactly between faint and bright (counted in neither)
+	hue_bin = numpy.minimum(h.astype(numpy.uint16) * 6 // 255, 5)
+	category = numpy.where(
+		intensity < 256 // 8,
+		0,
+		numpy.where(
+			s < 256 // 3,
+			1,
+			numpy.where(
+				s < 256 * 2 // 3,
+				2 + hue_bin,
+				numpy.where(s > 256 * 2 // 3, 8 + hue_bin, 14),
+			),
+		),
+	)
+	counts = numpy.bincount(category, minlength=15)
+	frac_black = counts[0] / intensity.size
+	frac_gray = counts[1] / intensity.size
+	# number of pixels in any color bin, for normalizing the hue sub-bins
+	c = max(1, int(counts[2:].sum()))
+	h_faint_counts = counts[2:8]
+	h_bright_counts = counts[8:14]
 
 	# now we have fractions in each category (6*2 + 2 = 14 bins)
 	# convert to hash and discretize:
@@ -225,13 +307,13 @@ def colorhash(image: 'Image.Image', binbits: int = 3) -> ImageHash:
 	for counts in list(h_faint_counts) + list(h_bright_counts):
 		values.append(min(maxvalue - 1, int(counts / c * maxvalue)))
 	# print(values)
-	bitarray = []
-	for v in values:
-		bitarray += [
-			v // (2 ** (binbits - i - 1)) % 2 ** (binbits - i) > 0
-			for i in range(binbits)
-		]
-	return ImageHash(numpy.asarray(bitarray).reshape((-1, binbits)))
+	# vectorized version of the old per-bit loop:
+	# v // 2**(binbits-i-1) % 2**(binbits-i) > 0 for each value and bit i
+	vals = numpy.asarray(values, dtype=numpy.int64)[:, None]
+	divisors = 2 ** numpy.arange(binbits - 1, -1, -1, dtype=numpy.int64)
+	moduli = 2 ** numpy.arange(binbits, 0, -1, dtype=numpy.int64)
+	bitarray = vals // divisors % moduli > 0
+	return ImageHash(bitarray)
 
 
 def crop_resistant_hash(
@@ -261,46 +343,72 @@ def crop_resistant_hash(
 	"""
 
 	orig_image = image.copy()
-	# Convert to gray scale and resize
+	# Convert to gray scale and resize. Segmentation wants area-averaged
+	# brightness rather than sub-pixel sharpness (LANCZOS can ring), so the
+	# much cheaper BOX filter is the better fit here; the per-segment hashes
+	# later still use the antialiased resize.
 	image = image.convert('L').resize(
-		(segmentation_image_size, segmentation_image_size), ANTIALIAS
+		(segmentation_image_size, segmentation_image_size), BOX
 	)
-	# Add filters
+	# Add filters. Always PIL: OpenCV's blur kernels are faster but produce
+	# slightly different pixels, and hashes must not depend on which optional
+	# packages happen to be installed.
 	image = image.filter(ImageFilter.GaussianBlur()).filter(ImageFilter.MedianFilter())
-	pixels = numpy.array(image).astype(numpy.float32)
+	# segmentation only thresholds the pixels, so stay on the uint8 buffer
+	# instead of copying into a 4x larger float array
+	pixels = numpy.asarray(image)
 
 	segments = _find_all_segments(pixels, segment_threshold, min_segment_size)
 
 	# If there are no segments, have 1 segment including the whole image
 	if not segments:
-		full_image_segment = {
-			(0, 0),
-			(segmentation_image_size - 1, segmentation_image_size - 1),
-		}
+		full_image_segment = numpy.array(
+			[
+				(0, 0),
+				(segmentation_image_size - 1, segmentation_image_size - 1),
+			],
+			dtype=numpy.int32,
+		)
 		segments.append(full_image_segment)
 
 	# If segment limit is set, discard the smaller segments
 	if limit_segments:
-		segments = sorted(segments, key=lambda s: len(s), reverse=True)[:limit_segments]
+		segments = sorted(segments, key=lambda s: s.shape[0], reverse=True)[
+			:limit_segments
+		]
 
 	# Create bounding box for each segment
-	hashes = []
+	orig_w, orig_h = orig_image.size
+	scale_w = float(orig_w) / segmentation_image_size
+	scale_h = float(orig_h) / segmentation_image_size
+	bounding_boxes = []
 	for segment in segments:
-		orig_w, orig_h = orig_image.size
-		scale_w = float(orig_w) / segmentation_image_size
-		scale_h = float(orig_h) / segmentation_image_size
-		min_y = min(coord[0] for coord in segment) * scale_h
-		min_x = min(coord[1] for coord in segment) * scale_w
-		max_y = (max(coord[0] for coord in segment) + 1) * scale_h
-		max_x = (max(coord[1] for coord in segment) + 1) * scale_w
-		# Compute robust hash for each bounding box
-		bounding_box = orig_image.crop((min_x, min_y, max_x, max_y))
-		hashes.append(hash_func(bounding_box))
-		# Show bounding box
-		# im_segment = image.copy()
-		# for pix in segment:
-		# 	im_segment.putpixel(pix[::-1], 255)
-		# im_segment.show()
-		# bounding_box.show()
+		min_y, min_x = segment.min(axis=0)
+		max_y, max_x = segment.max(axis=0) + 1
+		bounding_boxes.append(
+			(min_x * scale_w, min_y * scale_h, max_x * scale_w, max_y * scale_h)
+		)
+
+	# Compute robust hash for each bounding box
+	if hash_func is dhash:
+		# Fast path for the default hash function: gather the resized crops
+		# into one array and compute all the column differences in a single
+		# vectorized comparison, instead of one dhash call per segment.
+		hash_size = 8  # dhash's default
+		batch = numpy.stack(
+			[
+				numpy.asarray(
+					reduce_prefilter(orig_image.crop(bounding_box), hash_size)
+					.convert('L')
+					.resize((hash_size + 1, hash_size), ANTIALIAS)
+				)
+				for bounding_box in bounding_boxes
+			]
+		)
+		hashes = dhash_batch(batch)
+	else:
+		hashes = [
+			hash_func(orig_image.crop(bounding_box)) for bounding_box in bounding_boxes
+		]
 
 	return ImageMultiHash(hashes)
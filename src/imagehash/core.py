@@ -6,12 +6,30 @@ from typing import TYPE_CHECKING
 
 import numpy
 
-from imagehash.utils import binary_array_to_hex
+from imagehash.utils import binary_array_to_hex, pack_hash, popcount
 
 if TYPE_CHECKING:
 	from imagehash.types import NDArray
 
 
+def hamming_many(query_packed: numpy.ndarray, corpus_packed: numpy.ndarray) -> numpy.ndarray:
+	"""
+	Computes the hamming distance of one packed hash (as stored in ImageHash._packed)
+	against a 2-d array of packed hashes, one row per hash. Returns an int32 vector of
+	distances.
+	"""
+	return popcount(corpus_packed ^ query_packed).sum(axis=-1, dtype=numpy.int32)
+
+
+def hamming_matrix(a_packed: numpy.ndarray, b_packed: numpy.ndarray) -> numpy.ndarray:
+	"""
+	Computes all pairwise hamming distances between two 2-d arrays of packed
+	hashes, one row per hash. Returns an int32 matrix of shape (len(a), len(b)).
+	"""
+	xor = a_packed[:, None, :] ^ b_packed[None, :, :]
+	return popcount(xor).sum(axis=-1, dtype=numpy.int32)
+
+
 class ImageHash:
 	"""
 	Hash encapsulation. Can be used for dictionary keys and comparisons.
@@ -19,9 +37,14 @@ class ImageHash:
 
 	def __init__(self, binary_array: 'NDArray') -> None:
 		self.hash = binary_array
+		# ravel() gives a view on contiguous input, unlike flatten() which
+		# always copies; every operator below works on the flat form
+		self._flat = binary_array.ravel()
+		self._packed = pack_hash(binary_array)
+		self._cached_hash: int | None = None
 
 	def __str__(self) -> str:
-		return binary_array_to_hex(self.hash.flatten())
+		return binary_array_to_hex(self._flat)
 
 	def __repr__(self) -> str:
 		return repr(self.hash)
@@ -35,23 +58,28 @@ class ImageHash:
 				self.hash.shape,
 				other.hash.shape,
 			)
-		return int(numpy.count_nonzero(self.hash.flatten() != other.hash.flatten()))
+		# XOR the packed words and count set bits, instead of comparing
+		# one byte per bit on the boolean arrays
+		return int(popcount(self._packed ^ other._packed).sum())
 
 	def __eq__(self, other):
 		# type: (object) -> bool
 		if other is None:
 			return False
-		return numpy.array_equal(self.hash.flatten(), other.hash.flatten())  # type: ignore
+		return numpy.array_equal(self._flat, other._flat)  # type: ignore
 
 	def __ne__(self, other):
 		# type: (object) -> bool
 		if other is None:
 			return False
-		return not numpy.array_equal(self.hash.flatten(), other.hash.flatten())  # type: ignore
+		return not numpy.array_equal(self._flat, other._flat)  # type: ignore
 
 	def __hash__(self) -> int:
 		# this returns a 8 bit integer, intentionally shortening the information
-		return sum([2 ** (i % 8) for i, v in enumerate(self.hash.flatten()) if v])
+		if self._cached_hash is None:
+			packed = numpy.packbits(self._flat.astype(numpy.uint8, copy=False))
+			self._cached_hash = int(packed[0])
+		return self._cached_hash
 
 	def __len__(self) -> int:
 		# Returns the bit length of the hash
@@ -66,6 +94,18 @@ class ImageMultiHash:
 
 	def __init__(self, hashes: list[ImageHash]) -> None:
 		self.segment_hashes = hashes
+		self._packed_cache: numpy.ndarray | None = None
+
+	@property
+	def _packed_matrix(self) -> numpy.ndarray:
+		"""
+		The packed segment hashes stacked into one (segments, words) matrix.
+		Built lazily and cached, so that repeated comparisons (e.g. best_match
+		against a corpus) do not restack the same arrays per candidate.
+		"""
+		if self._packed_cache is None:
+			self._packed_cache = numpy.stack([h._packed for h in self.segment_hashes])
+		return self._packed_cache
 
 	def __eq__(self, other):
 		# type: (object) -> bool
@@ -111,17 +151,32 @@ class ImageMultiHash:
 			if bit_error_rate is None:
 				bit_error_rate = 0.25
 			hamming_cutoff = len(self.segment_hashes[0]) * bit_error_rate
-		# Get the hash distance for each region hash within cutoff
-		distances = []
-		for segment_hash in self.segment_hashes:
-			lowest_distance = min(
-				segment_hash - other_segment_hash
-				for other_segment_hash in other_hash.segment_hashes
+		if len(self.segment_hashes[0]) != len(other_hash.segment_hashes[0]):
+			raise TypeError(
+				'ImageHashes must be of the same shape.',
+				self.segment_hashes[0].hash.shape,
+				other_hash.segment_hashes[0].hash.shape,
 			)
-			if lowest_distance > hamming_cutoff:
-				continue
-			distances.append(lowest_distance)
-		return len(distances), sum(distances)
+		# Get the hash distance for each region hash within cutoff,
+		# computing all segment pairs in one vectorized call. Segments with an
+		# exact duplicate in the other hash are known to have the lowest
+		# possible distance of 0, so skip the distance computation for them --
+		# on duplicate-heavy corpora this short-circuits most of the work.
+		self_packed = self._packed_matrix
+		other_packed = other_hash._packed_matrix
+		other_rows = {row.tobytes() for row in other_packed}
+		exact_match = numpy.fromiter(
+			(row.tobytes() in other_rows for row in self_packed),
+			dtype=bool,
+			count=len(self_packed),
+		)
+		lowest_distances = numpy.zeros(len(self_packed), dtype=numpy.int32)
+		if not exact_match.all():
+			lowest_distances[~exact_match] = hamming_matrix(
+				self_packed[~exact_match], other_packed
+			).min(axis=1)
+		within_cutoff = lowest_distances <= hamming_cutoff
+		return int(within_cutoff.sum()), int(lowest_distances[within_cutoff].sum())
 
 	def matches(
 		self, other_hash: 'ImageMultiHash', region_cutoff: int = 1, hamming_cutoff: float | None = None, bit_error_rate: float | None = None
@@ -1,5 +1,4 @@
 import unittest
-from datetime import datetime
 
 import imagehash
 from tests.utils import TestImageHash
@@ -65,18 +64,22 @@ class Test(TestImageHash):
 		)
 
 	def test_segmentation_image_size(self):
-		start_time = datetime.now()
-		imagehash.crop_resistant_hash(self.image, segmentation_image_size=200)
-		small_timed = datetime.now() - start_time
-
-		start_time = datetime.now()
-		imagehash.crop_resistant_hash(self.image, segmentation_image_size=400)
-		large_timed = datetime.now() - start_time
+		small_seg_hash = imagehash.crop_resistant_hash(
+			self.peppers, segmentation_image_size=200
+		)
+		large_seg_hash = imagehash.crop_resistant_hash(
+			self.peppers, segmentation_image_size=400
+		)
 
 		self.assertGreater(
-			large_timed,
-			small_timed,
-			'Hashing should take longer when the segmentation image is larger',
+			len(large_seg_hash.segment_hashes),
+			len(small_seg_hash.segment_hashes),
+			'A larger segmentation image should resolve more segments',
+		)
+		self.assertEqual(
+			small_seg_hash,
+			large_seg_hash,
+			'Hashes should still match, as the major segments are present in both',
 		)
 
 	def test_min_segment_size(self):
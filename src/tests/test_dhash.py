@@ -1,6 +1,9 @@
 import unittest
 
+import numpy
+
 import imagehash
+from imagehash.utils import reduce_prefilter
 from tests.utils import TestImageHash
 
 
@@ -21,6 +24,34 @@ class Test(TestImageHash):
 	def test_dhash_size(self):
 		self.check_hash_size(self.func, self.image)
 
+	def test_dhash_batch(self):
+		hash_size = 8
+		images = [
+			self.image,
+			self.image.rotate(-1),
+			self.image.crop((10, 10, 300, 250)),
+			self.get_data_image('peppers.png'),
+		]
+		# resize the way dhash resizes, then hash all images in one call
+		batch = numpy.stack(
+			[
+				numpy.asarray(
+					reduce_prefilter(image, hash_size)
+					.convert('L')
+					.resize((hash_size + 1, hash_size), imagehash.ANTIALIAS)
+				)
+				for image in images
+			]
+		)
+		batch_hashes = imagehash.dhash_batch(batch)
+		for image, batch_hash in zip(images, batch_hashes, strict=True):
+			emsg = f'dhash_batch differs from dhash for {image}'
+			self.assertEqual(batch_hash, self.func(image, hash_size), emsg)
+
+	def test_dhash_batch_wrong_dimensions(self):
+		with self.assertRaises(ValueError):
+			imagehash.dhash_batch(numpy.zeros((8, 9), dtype=numpy.uint8))
+
 
 if __name__ == '__main__':
 	unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy
+
+import imagehash
+from tests.utils import TestImageHash
+
+
+class Test(TestImageHash):
+	def setUp(self):
+		self.image = self.get_data_image()
+		self.hashes = [
+			imagehash.dhash(image)
+			for image in (
+				self.image,
+				self.image.rotate(-1),
+				self.image.crop((10, 10, 300, 250)),
+				self.get_data_image('peppers.png'),
+			)
+		]
+
+	def test_hamming_many(self):
+		query = self.hashes[0]
+		corpus = numpy.stack([other._packed for other in self.hashes])
+		distances = imagehash.hamming_many(query._packed, corpus)
+		for other, distance in zip(self.hashes, distances, strict=True):
+			emsg = f'hamming_many differs from {query} - {other}'
+			self.assertEqual(int(distance), query - other, emsg)
+
+	def test_hamming_matrix(self):
+		first, second = self.hashes[:2], self.hashes[2:]
+		matrix = imagehash.hamming_matrix(
+			numpy.stack([query._packed for query in first]),
+			numpy.stack([other._packed for other in second]),
+		)
+		self.assertEqual(matrix.shape, (len(first), len(second)))
+		for row, query in enumerate(first):
+			for column, other in enumerate(second):
+				emsg = f'hamming_matrix differs from {query} - {other}'
+				self.assertEqual(int(matrix[row, column]), query - other, emsg)
+
+
+if __name__ == '__main__':
+	unittest.main()
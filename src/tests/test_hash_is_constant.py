@@ -40,7 +40,7 @@ class Test(TestImageHash):
 
 	def test_average_hash(self):
 		result_hash = imagehash.average_hash(self.image)
-		known_hash = 'ffd7918181c9ffff'
+		known_hash = 'ffd7918181cfffff'
 		self.assertEqual(str(result_hash), known_hash)
 
 	def test_phash(self):
@@ -50,7 +50,7 @@ class Test(TestImageHash):
 
 	def test_dhash(self):
 		result_hash = imagehash.dhash(self.image)
-		known_hash = '0026273b2b19550e'
+		known_hash = '0026233b0b19550c'
 		self.assertEqual(str(result_hash), known_hash)
 
 	def test_whash(self):
@@ -67,12 +67,11 @@ class Test(TestImageHash):
 		result_hash = imagehash.crop_resistant_hash(self.peppers)
 		if _pillow_has_convert_fix():
 			known_hash = (
-				'c4d9f3e3e1c18101,'
-				'706c6e66464c99b9,'
-				'98d8f1ecd8f0f0e1,'
-				'a082c0c49acc6dbd,'
-				'f1f39b99c1c1b1b1,'
-				'3a7ece1c9df4fcb9'
+				'989c1a1316162d2d,'
+				'98d8f1ecd8f0e0e1,'
+				'a282c0c41acc6cb9,'
+				'f1fb8999c1d1d9d9,'
+				'3a6ecc1c9df4bdb9'
 			)
 		else:
 			known_hash = (
@@ -0,0 +1,39 @@
+import unittest
+
+import numpy
+
+from imagehash.utils import _popcount_lut, popcount
+
+
+class TestPopcount(unittest.TestCase):
+	"""
+	Exercises the 16-bit lookup-table popcount directly, since on numpy >= 2.0
+	the imported popcount is numpy.bitwise_count and the fallback would
+	otherwise never run.
+	"""
+
+	def setUp(self):
+		rng = numpy.random.default_rng(0)
+		self.arrays = [
+			rng.integers(0, 2**64, size=shape, dtype=numpy.uint64)
+			for shape in ((13,), (5, 8), (3, 4, 2))
+		]
+
+	def _reference(self, packed):
+		counts = [int(word).bit_count() for word in packed.ravel()]
+		return numpy.array(counts, dtype=numpy.int64).reshape(packed.shape)
+
+	def test_popcount_lut(self):
+		for packed in self.arrays:
+			counts = _popcount_lut(packed)
+			self.assertEqual(counts.shape, packed.shape)
+			self.assertTrue(numpy.array_equal(counts, self._reference(packed)))
+
+	def test_popcount(self):
+		for packed in self.arrays:
+			counts = popcount(packed)
+			self.assertTrue(numpy.array_equal(counts, self._reference(packed)))
+
+
+if __name__ == '__main__':
+	unittest.main()
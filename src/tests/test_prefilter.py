@@ -0,0 +1,50 @@
+import unittest
+
+import imagehash
+from imagehash.utils import reduce_prefilter
+from tests.utils import TestImageHash
+
+
+class Test(TestImageHash):
+	def setUp(self):
+		# large enough that the prefilter triggers for every hash function
+		self.image = self.get_data_image().resize((1200, 600))
+
+	def test_prefilter_reduces_large_images(self):
+		reduced = reduce_prefilter(self.image, 8)
+		self.assertLess(min(reduced.size), min(self.image.size))
+		self.assertGreaterEqual(min(reduced.size), 8 * 4)
+
+	def test_prefilter_skips_small_images(self):
+		small = self.image.resize((60, 30))
+		self.assertEqual(reduce_prefilter(small, 8).size, small.size)
+
+	def test_prefilter_skips_unsupported_modes(self):
+		# Image.reduce raises ValueError for palette and bilevel images;
+		# the prefilter must pass those through untouched
+		for mode in ('P', '1'):
+			converted = self.image.convert(mode)
+			self.assertEqual(reduce_prefilter(converted, 8).size, converted.size)
+
+	def test_hashing_palette_and_bilevel_images(self):
+		funcs = [
+			imagehash.average_hash,
+			imagehash.phash,
+			imagehash.phash_simple,
+			imagehash.dhash,
+			imagehash.dhash_vertical,
+			imagehash.whash,
+			imagehash.colorhash,
+		]
+		for mode in ('P', '1'):
+			converted = self.image.convert(mode)
+			for func in funcs:
+				emsg = f'{func.__name__} failed on a large {mode}-mode image'
+				self.assertTrue(len(func(converted)) > 0, emsg)
+			multi_hash = imagehash.crop_resistant_hash(converted)
+			emsg = f'crop_resistant_hash failed on a large {mode}-mode image'
+			self.assertTrue(len(multi_hash.segment_hashes) > 0, emsg)
+
+
+if __name__ == '__main__':
+	unittest.main()